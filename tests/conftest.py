@@ -1,47 +1,165 @@
 """Pytest configuration and fixtures for interactive session workflow tests."""
 
+import re
+from functools import lru_cache
 from pathlib import Path
 
 import pytest
 
+# Pre-migration references that must no longer appear in workflow.yaml / start.sh
+OLD_WORKFLOW_PATTERNS = (
+    "steps-v3",
+    "utility_wait_target_hostname",
+    "utility_wait_service_port",
+    "utility_wait_ready",
+    "utility_inputs",
+    "utility_compute_session",
+)
+OLD_START_SCRIPT_PATTERNS = (
+    "service.json",
+    "steps-v3",
+    "start-template-v3",
+    "controller-v3",
+)
 
-@pytest.fixture
+
+def safe_load(stream):
+    """Parse YAML with libyaml's CSafeLoader, falling back to the pure-Python SafeLoader."""
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(stream, Loader=loader)
+
+
+@lru_cache(maxsize=None)
+def _read_yaml(path: str):
+    """Parse a YAML file, caching the result by path for the whole run."""
+    with open(path) as f:
+        return safe_load(f)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _finalize_caches():
+    """Clear module-level caches once, at the end of the test session.
+
+    Cached functions (add new ones here rather than clearing them per test):
+    - _read_yaml
+    """
+    yield
+    _read_yaml.cache_clear()
+
+
+class _TokenIndex(dict):
+    """Map each looked-up substring to whether it occurs in ``text``.
+
+    Each distinct token is searched for once and the answer is reused by every
+    later test that asks for it.
+    """
+
+    def __init__(self, text: str):
+        super().__init__()
+        self.text = text
+
+    def __missing__(self, token: str) -> bool:
+        present = self[token] = token in self.text
+        return present
+
+
+@pytest.fixture(scope="session")
+def yaml_module():
+    """Return the yaml module, imported on first use rather than at collection time."""
+    import yaml
+
+    return yaml
+
+
+@pytest.fixture(scope="session")
+def yaml_safe_load():
+    """Return the conftest safe_load helper (C loader when libyaml is available)."""
+    return safe_load
+
+
+@pytest.fixture(scope="session")
 def repo_root() -> Path:
     """Return the repository root directory."""
     return Path(__file__).parent.parent
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def workflows_dir(repo_root: Path) -> Path:
     """Return the workflows directory."""
     return repo_root / "workflows"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def hello_world_dir(workflows_dir: Path) -> Path:
     """Return the hello-world workflow directory."""
     return workflows_dir / "hello-world"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def workflow_yaml(hello_world_dir: Path) -> Path:
     """Return the hello-world workflow.yaml path."""
     return hello_world_dir / "workflow.yaml"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def start_script(hello_world_dir: Path) -> Path:
     """Return the hello-world start.sh path."""
     return hello_world_dir / "start.sh"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def workflow_content(workflow_yaml: Path) -> str:
     """Return the workflow.yaml file content."""
     return workflow_yaml.read_text()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def start_script_content(start_script: Path) -> str:
     """Return the start.sh file content."""
     return start_script.read_text()
+
+
+@pytest.fixture(scope="session")
+def start_script_index(start_script_content: str) -> dict:
+    """Return line-level facts about start.sh, computed in a single pass."""
+    lines = start_script_content.split("\n")
+    non_comment = [line for line in lines if line.strip() and not line.strip().startswith("#")]
+    return {
+        "first_line": lines[0].strip(),
+        "non_comment_count": len(non_comment),
+        "content": start_script_content,
+    }
+
+
+@pytest.fixture(scope="session")
+def workflow_tokens(workflow_content: str) -> _TokenIndex:
+    """Return a cached substring-presence index over workflow.yaml."""
+    return _TokenIndex(workflow_content)
+
+
+@pytest.fixture(scope="session")
+def old_workflow_pattern_re() -> re.Pattern:
+    """Return one regex matching any old pattern that workflow.yaml must not use."""
+    return re.compile("|".join(map(re.escape, OLD_WORKFLOW_PATTERNS)))
+
+
+@pytest.fixture(scope="session")
+def old_start_script_pattern_re() -> re.Pattern:
+    """Return one regex matching any old pattern that start.sh must not use."""
+    return re.compile("|".join(map(re.escape, OLD_START_SCRIPT_PATTERNS)))
+
+
+@pytest.fixture(scope="session")
+def workflow_data(workflow_yaml: Path) -> dict:
+    """Return the parsed hello-world workflow.yaml."""
+    return _read_yaml(str(workflow_yaml))
+
+
+@pytest.fixture(scope="session")
+def loaded_workflow_cache():
+    """Return a loader that parses each workflow.yaml at most once per run."""
+    def get(path: Path) -> dict:
+        return _read_yaml(str(path))
+    return get
@@ -0,0 +1,20 @@
+"""Tests for workflow YAML job dependencies."""
+
+import pytest
+
+pytestmark = pytest.mark.io
+
+
+class TestWorkflowJobDependencies:
+    """Test that workflow job dependencies are correct."""
+
+    @pytest.mark.parametrize("job,dependency", [
+        ("session_runner", "preprocessing"),
+        ("wait_for_service", "preprocessing"),
+        ("update_session", "wait_for_service"),
+        ("complete", "update_session"),
+    ])
+    def test_job_depends_on(self, workflow_data: dict, job: str, dependency: str):
+        """Test that each job depends on the job it needs outputs from."""
+        needs = workflow_data.get("jobs", {}).get(job, {}).get("needs", [])
+        assert dependency in needs, f"{job} must depend on {dependency}"
@@ -0,0 +1,52 @@
+"""Tests for workflow YAML jobs and the actions they use."""
+
+import pytest
+
+pytestmark = pytest.mark.io
+
+
+class TestWorkflowJobs:
+    """Test that workflow.yaml has the required jobs."""
+
+    @pytest.mark.parametrize("job", [
+        "preprocessing",
+        "session_runner",
+        "wait_for_service",
+        "update_session",
+        "complete",
+    ])
+    def test_has_job(self, workflow_data: dict, job: str):
+        """Test that workflow.yaml has each required job."""
+        assert job in workflow_data.get("jobs", {}), f"workflow.yaml must have '{job}' job"
+
+
+class TestWorkflowUsesCheckout:
+    """Test that workflow checks out service scripts."""
+
+    def test_preprocessing_uses_checkout(self, workflow_data: dict):
+        """Test that preprocessing job uses parallelworks/checkout."""
+        preprocessing = workflow_data.get("jobs", {}).get("preprocessing", {})
+        steps = preprocessing.get("steps", [])
+        checkout_found = False
+        for step in steps:
+            uses = step.get("uses", "")
+            if "parallelworks/checkout" in uses:
+                checkout_found = True
+                break
+        assert checkout_found, "preprocessing job must use 'parallelworks/checkout'"
+
+
+class TestWorkflowUsesUpdateSession:
+    """Test that workflow uses parallelworks/update-session."""
+
+    def test_update_session_job_uses_update_session(self, workflow_data: dict):
+        """Test that update_session job uses parallelworks/update-session."""
+        update_session = workflow_data.get("jobs", {}).get("update_session", {})
+        steps = update_session.get("steps", [])
+        update_session_found = False
+        for step in steps:
+            uses = step.get("uses", "")
+            if "parallelworks/update-session" in uses:
+                update_session_found = True
+                break
+        assert update_session_found, "update_session job must use 'parallelworks/update-session'"
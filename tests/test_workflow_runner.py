@@ -1,82 +1,131 @@
 """Tests for the local workflow runner."""
 
-import os
+import copy
 import sys
-import tempfile
 from pathlib import Path
 
 import pytest
-import yaml
 
-# Add tools directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+REPO_ROOT = Path(__file__).parent.parent
 
-from workflow_runner import (
-    WorkflowRunner,
-    ExecutionContext,
-    JobOutput,
-    parse_input_arg,
-    build_nested_dict,
-    get_default_inputs,
-)
+
+@pytest.fixture(scope="session")
+def runner_module():
+    """Import tools/workflow_runner.py on first use rather than at collection time."""
+    sys.path.insert(0, str(REPO_ROOT / 'tools'))
+    import workflow_runner
+    return workflow_runner
+
+
+def _all_workflows() -> list[Path]:
+    """Return the workflow.yaml path of every workflow in the repository."""
+    return sorted((REPO_ROOT / "workflows").glob("*/workflow.yaml"))
+
+
+@pytest.fixture(scope="session")
+def temp_work_dir(tmp_path_factory):
+    """Return a working directory shared by the dry-run tests (nothing is written to it)."""
+    return tmp_path_factory.mktemp("dryrun", numbered=False)
+
+
+@pytest.fixture(scope="module")
+def hello_world_workflow(repo_root):
+    """Return path to hello-world workflow."""
+    return repo_root / "workflows" / "hello-world" / "workflow.yaml"
+
+
+@pytest.fixture(scope="module")
+def basic_context(runner_module, temp_work_dir):
+    """Create a basic execution context shared by read-only tests."""
+    return runner_module.ExecutionContext(
+        inputs={
+            "resource": {"ip": "localhost", "id": "test", "schedulerType": ""},
+            "workflow_dir": "hello-world",
+            "hello": {"message": "Test"},
+        },
+        sessions={},
+        job_outputs={},
+        env_vars={
+            "PW_WORKFLOW_NAME": "hello-world",
+            "PW_JOB_NUMBER": "1",
+            "PW_USER": "testuser",
+            "PW_PLATFORM_HOST": "localhost",
+        },
+        work_dir=temp_work_dir,
+        dry_run=True,
+    )
+
+
+@pytest.fixture
+def mutable_context(basic_context):
+    """Return a private copy of basic_context for tests that mutate it."""
+    return copy.deepcopy(basic_context)
+
+
+@pytest.fixture(scope="module")
+def loaded_runner(runner_module, hello_world_workflow, basic_context, loaded_workflow_cache):
+    """Return a runner with the hello-world workflow loaded, for read-only tests."""
+    runner = runner_module.WorkflowRunner(hello_world_workflow, basic_context)
+    runner.workflow = loaded_workflow_cache(hello_world_workflow)
+    return runner
 
 
 class TestParseInputArg:
     """Test input argument parsing."""
 
-    def test_simple_string(self):
-        key, value = parse_input_arg("message=hello")
+    def test_simple_string(self, runner_module):
+        key, value = runner_module.parse_input_arg("message=hello")
         assert key == "message"
         assert value == "hello"
 
-    def test_nested_key(self):
-        key, value = parse_input_arg("resource.ip=localhost")
+    def test_nested_key(self, runner_module):
+        key, value = runner_module.parse_input_arg("resource.ip=localhost")
         assert key == "resource.ip"
         assert value == "localhost"
 
-    def test_boolean_true(self):
-        key, value = parse_input_arg("enabled=true")
+    def test_boolean_true(self, runner_module):
+        key, value = runner_module.parse_input_arg("enabled=true")
         assert key == "enabled"
         assert value is True
 
-    def test_boolean_false(self):
-        key, value = parse_input_arg("enabled=false")
+    def test_boolean_false(self, runner_module):
+        key, value = runner_module.parse_input_arg("enabled=false")
         assert key == "enabled"
         assert value is False
 
-    def test_integer(self):
-        key, value = parse_input_arg("count=42")
+    def test_integer(self, runner_module):
+        key, value = runner_module.parse_input_arg("count=42")
         assert key == "count"
         assert value == 42
 
-    def test_invalid_format(self):
+    def test_invalid_format(self, runner_module):
         with pytest.raises(ValueError, match="Invalid input format"):
-            parse_input_arg("invalid")
+            runner_module.parse_input_arg("invalid")
 
 
 class TestBuildNestedDict:
     """Test nested dictionary building."""
 
-    def test_simple_key(self):
-        result = build_nested_dict([("key", "value")])
+    def test_simple_key(self, runner_module):
+        result = runner_module.build_nested_dict([("key", "value")])
         assert result == {"key": "value"}
 
-    def test_nested_keys(self):
-        result = build_nested_dict([
+    def test_nested_keys(self, runner_module):
+        result = runner_module.build_nested_dict([
             ("resource.ip", "localhost"),
             ("resource.port", 22),
         ])
         assert result == {"resource": {"ip": "localhost", "port": 22}}
 
-    def test_deep_nesting(self):
-        result = build_nested_dict([("a.b.c.d", "value")])
+    def test_deep_nesting(self, runner_module):
+        result = runner_module.build_nested_dict([("a.b.c.d", "value")])
         assert result == {"a": {"b": {"c": {"d": "value"}}}}
 
 
 class TestGetDefaultInputs:
     """Test default input extraction from workflow."""
 
-    def test_extracts_simple_defaults(self):
+    def test_extracts_simple_defaults(self, runner_module):
         workflow = {
             "on": {
                 "execute": {
@@ -86,10 +135,10 @@ class TestGetDefaultInputs:
                 }
             }
         }
-        defaults = get_default_inputs(workflow)
+        defaults = runner_module.get_default_inputs(workflow)
         assert defaults["message"] == "hello"
 
-    def test_extracts_group_defaults(self):
+    def test_extracts_group_defaults(self, runner_module):
         workflow = {
             "on": {
                 "execute": {
@@ -104,95 +153,70 @@ class TestGetDefaultInputs:
                 }
             }
         }
-        defaults = get_default_inputs(workflow)
+        defaults = runner_module.get_default_inputs(workflow)
         assert defaults["slurm.time"] == "04:00:00"
 
 
+@pytest.mark.io
 class TestWorkflowRunner:
     """Test WorkflowRunner class."""
 
-    @pytest.fixture
-    def temp_work_dir(self):
-        """Create temporary working directory."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            yield Path(tmpdir)
-
-    @pytest.fixture
-    def hello_world_workflow(self, repo_root):
-        """Return path to hello-world workflow."""
-        return repo_root / "workflows" / "hello-world" / "workflow.yaml"
-
-    @pytest.fixture
-    def basic_context(self, temp_work_dir):
-        """Create a basic execution context."""
-        return ExecutionContext(
-            inputs={
-                "resource": {"ip": "localhost", "id": "test", "schedulerType": ""},
-                "workflow_dir": "hello-world",
-                "hello": {"message": "Test"},
-            },
-            sessions={},
-            job_outputs={},
-            env_vars={
-                "PW_WORKFLOW_NAME": "hello-world",
-                "PW_JOB_NUMBER": "1",
-                "PW_USER": "testuser",
-                "PW_PLATFORM_HOST": "localhost",
-            },
-            work_dir=temp_work_dir,
-            dry_run=True,
-        )
-
-    def test_load_workflow(self, hello_world_workflow, basic_context):
+    def test_load_workflow(self, runner_module, hello_world_workflow, basic_context):
         """Test workflow loading."""
-        runner = WorkflowRunner(hello_world_workflow, basic_context)
+        runner = runner_module.WorkflowRunner(hello_world_workflow, basic_context)
         runner.load_workflow()
 
         assert "jobs" in runner.workflow
         assert "preprocessing" in runner.workflow["jobs"]
 
-    def test_substitute_simple_input(self, hello_world_workflow, basic_context):
-        """Test simple variable substitution."""
-        runner = WorkflowRunner(hello_world_workflow, basic_context)
+    def test_substitute_skips_literal_steps(self, runner_module, hello_world_workflow, basic_context):
+        """Test that template-free workflow nodes are returned as-is, not copied."""
+        runner = runner_module.WorkflowRunner(hello_world_workflow, basic_context)
         runner.load_workflow()
 
-        result = runner.substitute_variables("${{ inputs.workflow_dir }}")
+        steps = [step for job in runner.workflow["jobs"].values() for step in job.get("steps", [])]
+        literal = [step for step in steps if "${{" not in str(step)]
+        templated = [step for step in steps if "${{" in str(step)]
+        assert literal and templated
+
+        for step in literal:
+            assert runner.substitute_variables(step) is step
+        for step in templated:
+            assert runner.substitute_variables(step) is not step
+
+    def test_substitute_simple_input(self, loaded_runner):
+        """Test simple variable substitution."""
+        result = loaded_runner.substitute_variables("${{ inputs.workflow_dir }}")
         assert result == "hello-world"
 
-    def test_substitute_nested_input(self, hello_world_workflow, basic_context):
+    def test_substitute_nested_input(self, loaded_runner):
         """Test nested variable substitution."""
-        runner = WorkflowRunner(hello_world_workflow, basic_context)
-        runner.load_workflow()
-
-        result = runner.substitute_variables("${{ inputs.resource.ip }}")
+        result = loaded_runner.substitute_variables("${{ inputs.resource.ip }}")
         assert result == "localhost"
 
-    def test_substitute_session(self, hello_world_workflow, basic_context):
+    def test_substitute_session(self, runner_module, hello_world_workflow, mutable_context, loaded_workflow_cache):
         """Test session variable substitution."""
-        basic_context.sessions["session"] = "my-session-id"
-        runner = WorkflowRunner(hello_world_workflow, basic_context)
-        runner.load_workflow()
+        mutable_context.sessions["session"] = "my-session-id"
+        runner = runner_module.WorkflowRunner(hello_world_workflow, mutable_context)
+        runner.workflow = loaded_workflow_cache(hello_world_workflow)
 
         result = runner.substitute_variables("${{ sessions.session }}")
         assert result == "my-session-id"
 
-    def test_substitute_job_output(self, hello_world_workflow, basic_context):
+    def test_substitute_job_output(self, runner_module, hello_world_workflow, mutable_context, loaded_workflow_cache):
         """Test job output variable substitution."""
-        basic_context.job_outputs["wait_for_service"] = JobOutput(
+        mutable_context.job_outputs["wait_for_service"] = runner_module.JobOutput(
             outputs={"HOSTNAME": "compute-node-1", "SESSION_PORT": "8080"}
         )
-        runner = WorkflowRunner(hello_world_workflow, basic_context)
-        runner.load_workflow()
+        runner = runner_module.WorkflowRunner(hello_world_workflow, mutable_context)
+        runner.workflow = loaded_workflow_cache(hello_world_workflow)
 
         result = runner.substitute_variables("${{ needs.wait_for_service.outputs.HOSTNAME }}")
         assert result == "compute-node-1"
 
-    def test_get_job_order(self, hello_world_workflow, basic_context):
+    def test_get_job_order(self, loaded_runner):
         """Test topological job ordering."""
-        runner = WorkflowRunner(hello_world_workflow, basic_context)
-        runner.load_workflow()
-
-        order = runner.get_job_order()
+        order = loaded_runner.get_job_order()
 
         # preprocessing must come before session_runner and wait_for_service
         assert order.index("preprocessing") < order.index("session_runner")
@@ -204,23 +228,40 @@ class TestWorkflowRunner:
         # update_session must come before complete
         assert order.index("update_session") < order.index("complete")
 
-    def test_dry_run_completes(self, hello_world_workflow, basic_context):
+    def test_get_job_order_detects_cycle(self, runner_module, hello_world_workflow, basic_context):
+        """Test that circular job dependencies are rejected."""
+        runner = runner_module.WorkflowRunner(hello_world_workflow, basic_context)
+        runner.workflow = {
+            "jobs": {
+                "first": {},
+                "a": {"needs": ["first", "b"]},
+                "b": {"needs": "a"},
+            }
+        }
+
+        with pytest.raises(ValueError, match="Circular dependency"):
+            runner.get_job_order()
+
+    @pytest.mark.timeout(10)
+    def test_dry_run_completes(self, runner_module, hello_world_workflow, mutable_context):
         """Test that dry run completes without errors."""
-        runner = WorkflowRunner(hello_world_workflow, basic_context)
+        # run() fills in sessions and job outputs
+        runner = runner_module.WorkflowRunner(hello_world_workflow, mutable_context)
         success = runner.run()
 
         # Dry run should complete (may have warnings but should not fail)
         assert isinstance(success, bool)
 
 
+@pytest.mark.io
 class TestWorkflowRunnerExpressions:
     """Test expression evaluation in WorkflowRunner."""
 
     @pytest.fixture
-    def runner_with_context(self, repo_root, temp_work_dir):
+    def runner_with_context(self, runner_module, repo_root, temp_work_dir, loaded_workflow_cache):
         """Create runner with test context."""
         workflow = repo_root / "workflows" / "hello-world" / "workflow.yaml"
-        context = ExecutionContext(
+        context = runner_module.ExecutionContext(
             inputs={
                 "resource": {"schedulerType": "slurm"},
                 "submit_to_scheduler": True,
@@ -231,15 +272,10 @@ class TestWorkflowRunnerExpressions:
             work_dir=temp_work_dir,
             dry_run=True,
         )
-        runner = WorkflowRunner(workflow, context)
-        runner.load_workflow()
+        runner = runner_module.WorkflowRunner(workflow, context)
+        runner.workflow = loaded_workflow_cache(workflow)
         return runner
 
-    @pytest.fixture
-    def temp_work_dir(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            yield Path(tmpdir)
-
     def test_equality_expression_true(self, runner_with_context):
         """Test equality expression that evaluates to true."""
         result = runner_with_context.substitute_variables(
@@ -261,43 +297,204 @@ class TestWorkflowRunnerExpressions:
         )
         assert result == "True"
 
+    def test_extra_context_expression(self, runner_with_context):
+        """Test that step-level names resolve from extra context and fall back to the text."""
+        template = "${{ item }}-${{ item == 'a' }}"
+        assert runner_with_context.substitute_variables(template, {"item": "a"}) == "a-True"
+        assert runner_with_context.substitute_variables(template) == "item-False"
+
+    def test_or_expression(self, runner_with_context):
+        """Test that || is true when any operand is truthy."""
+        result = runner_with_context.substitute_variables(
+            "${{ inputs.missing || inputs.resource.schedulerType }}"
+        )
+        assert result == "True"
+
+    def test_and_expression(self, runner_with_context):
+        """Test that && is false when any operand is falsy."""
+        result = runner_with_context.substitute_variables(
+            "${{ inputs.submit_to_scheduler && inputs.missing }}"
+        )
+        assert result == "False"
+
+
+@pytest.mark.io
+class TestWorkflowRunnerShellSteps:
+    """Test executing run steps through the runner's shell session."""
+
+    @pytest.fixture
+    def runner(self, runner_module, hello_world_workflow, tmp_path):
+        """Create a runner that really executes commands in tmp_path."""
+        context = runner_module.ExecutionContext(
+            inputs={},
+            sessions={},
+            job_outputs={},
+            env_vars={"GREETING": "hello"},
+            work_dir=tmp_path,
+        )
+        runner = runner_module.WorkflowRunner(hello_world_workflow, context)
+        yield runner
+        runner.close()
+
+    def test_collects_outputs(self, runner):
+        """Test that OUTPUTS entries and coordination files become step outputs."""
+        outputs = runner.run_shell_command(
+            'echo "greeting=$GREETING" >> "$OUTPUTS"; echo node-1 > HOSTNAME', {}
+        )
+        assert outputs == {"greeting": "hello", "HOSTNAME": "node-1"}
+
+    def test_failure_raises(self, runner):
+        """Test that a non-zero exit code fails the step."""
+        with pytest.raises(RuntimeError, match="exit code 3"):
+            runner.run_shell_command("exit 3", {})
+
+    def test_failure_prints_output_tail(self, runner, capsys):
+        """Test that a failing step shows the end of its output without --verbose."""
+        with pytest.raises(RuntimeError):
+            runner.run_shell_command("seq 1 500; echo boom >&2; exit 1", {})
+
+        out = capsys.readouterr().out
+        assert "      500\n" in out
+        assert "      300\n" not in out
+        assert "    STDERR:\n      boom\n" in out
+
+    def test_steps_do_not_share_shell_state(self, runner):
+        """Test that cd and variables from one step don't leak into the next."""
+        with pytest.raises(RuntimeError):
+            runner.run_shell_command("cd /; STATE=leaked; set -e; false", {})
+
+        outputs = runner.run_shell_command('echo "state=${STATE:-clean} cwd=$PWD" >> "$OUTPUTS"', {})
+        assert outputs["state"] == f"clean cwd={runner.context.work_dir}"
+
+
+@pytest.mark.io
+class TestWorkflowRunnerConcurrentJobs:
+    """Test running independent jobs at the same time with max_jobs."""
+
+    # a and b each wait for the other to start, so they only pass if they overlap
+    WORKFLOW = """
+jobs:
+  a:
+    steps:
+      - run: touch a.started; for i in $(seq 50); do [ -e b.started ] && break; sleep 0.1; done; [ -e b.started ]
+  b:
+    steps:
+      - run: touch b.started; for i in $(seq 50); do [ -e a.started ] && break; sleep 0.1; done; [ -e a.started ]
+  c:
+    needs: [a, b]
+    steps:
+      - run: echo "done=yes" >> "$OUTPUTS"
+  d:
+    needs: c
+    steps:
+      - run: exit 1
+  e:
+    needs: d
+    steps:
+      - run: echo unreachable
+"""
+
+    # Both jobs write PORT, then wait until the other has written too
+    SAME_KEY_WORKFLOW = """
+jobs:
+  a:
+    steps:
+      - run: echo PORT=1111 >> "$OUTPUTS"; touch a.started; for i in $(seq 50); do [ -e b.started ] && break; sleep 0.1; done
+  b:
+    steps:
+      - run: echo PORT=2222 >> "$OUTPUTS"; touch b.started; for i in $(seq 50); do [ -e a.started ] && break; sleep 0.1; done
+"""
+
+    def _run(self, runner_module, tmp_path, workflow_text):
+        """Run a workflow with two job slots and return (success, job_outputs)."""
+        workflow = tmp_path / "workflow.yaml"
+        workflow.write_text(workflow_text)
+        work_dir = tmp_path / "work"
+        work_dir.mkdir()
+        context = runner_module.ExecutionContext(
+            inputs={},
+            sessions={},
+            job_outputs={},
+            env_vars={},
+            work_dir=work_dir,
+            max_jobs=2,
+        )
+        success = runner_module.WorkflowRunner(workflow, context).run()
+        return success, context.job_outputs
+
+    @pytest.mark.timeout(30)
+    def test_independent_jobs_overlap(self, runner_module, tmp_path):
+        """Test that ready jobs run together and failures still skip dependents."""
+        success, outputs = self._run(runner_module, tmp_path, self.WORKFLOW)
+
+        assert success is False
+        assert list(outputs) == ["a", "b", "c", "d", "e"]
+        assert outputs["a"].success and outputs["b"].success
+        assert outputs["c"].outputs["done"] == "yes"
+        assert not outputs["d"].success
+        assert outputs["e"].error == "Dependency failed"
+
+    @pytest.mark.timeout(30)
+    def test_runner_usable_after_aborted_run(self, runner_module, tmp_path, monkeypatch):
+        """Test that an interrupted concurrent run doesn't stop the next run's steps."""
+        workflow = tmp_path / "workflow.yaml"
+        workflow.write_text("jobs:\n  a:\n    steps:\n      - run: echo ok=1 >> \"$OUTPUTS\"\n")
+        context = runner_module.ExecutionContext(
+            inputs={},
+            sessions={},
+            job_outputs={},
+            env_vars={},
+            work_dir=tmp_path,
+            max_jobs=2,
+        )
+        runner = runner_module.WorkflowRunner(workflow, context)
+
+        def interrupt(job_name, output):
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(runner, "_finish_job", interrupt)
+        with pytest.raises(KeyboardInterrupt):
+            runner.run()
+        monkeypatch.undo()
+
+        assert runner.run() is True
+        assert context.job_outputs["a"].outputs == {"ok": "1"}
+
+    @pytest.mark.timeout(30)
+    def test_concurrent_jobs_keep_their_own_outputs(self, runner_module, tmp_path):
+        """Test that jobs running at the same time don't see each other's OUTPUTS."""
+        success, outputs = self._run(runner_module, tmp_path, self.SAME_KEY_WORKFLOW)
+
+        assert success is True
+        assert outputs["a"].outputs == {"PORT": "1111"}
+        assert outputs["b"].outputs == {"PORT": "2222"}
 
+
+@pytest.mark.io
 class TestWorkflowValidation:
     """Test workflow validation through runner."""
 
-    @pytest.fixture
-    def workflows_dir(self, repo_root):
-        return repo_root / "workflows"
-
-    def test_all_workflows_load(self, workflows_dir):
-        """Test that all workflow.yaml files can be loaded."""
-        for workflow_dir in workflows_dir.iterdir():
-            if workflow_dir.is_dir():
-                workflow_yaml = workflow_dir / "workflow.yaml"
-                if workflow_yaml.exists():
-                    with open(workflow_yaml) as f:
-                        data = yaml.safe_load(f)
-                    assert "jobs" in data, f"{workflow_yaml} missing 'jobs'"
-                    assert "on" in data, f"{workflow_yaml} missing 'on'"
-
-    def test_all_workflows_have_valid_job_order(self, workflows_dir):
-        """Test that all workflows have valid job dependencies (no cycles)."""
-        for workflow_dir in workflows_dir.iterdir():
-            if workflow_dir.is_dir():
-                workflow_yaml = workflow_dir / "workflow.yaml"
-                if workflow_yaml.exists():
-                    with tempfile.TemporaryDirectory() as tmpdir:
-                        context = ExecutionContext(
-                            inputs={"resource": {"ip": "localhost", "schedulerType": ""}},
-                            sessions={},
-                            job_outputs={},
-                            env_vars={},
-                            work_dir=Path(tmpdir),
-                            dry_run=True,
-                        )
-                        runner = WorkflowRunner(workflow_yaml, context)
-                        runner.load_workflow()
-
-                        # This will raise if there's a cycle
-                        order = runner.get_job_order()
-                        assert len(order) > 0
+    @pytest.mark.parametrize("workflow_yaml_path", _all_workflows(), ids=lambda p: p.parent.name)
+    def test_workflow_loads(self, workflow_yaml_path, loaded_workflow_cache):
+        """Test that each workflow.yaml file can be loaded."""
+        data = loaded_workflow_cache(workflow_yaml_path)
+        assert "jobs" in data, f"{workflow_yaml_path} missing 'jobs'"
+        assert "on" in data, f"{workflow_yaml_path} missing 'on'"
+
+    @pytest.mark.parametrize("workflow_yaml_path", _all_workflows(), ids=lambda p: p.parent.name)
+    def test_workflow_has_valid_job_order(self, runner_module, workflow_yaml_path, loaded_workflow_cache, temp_work_dir):
+        """Test that each workflow has valid job dependencies (no cycles)."""
+        context = runner_module.ExecutionContext(
+            inputs={"resource": {"ip": "localhost", "schedulerType": ""}},
+            sessions={},
+            job_outputs={},
+            env_vars={},
+            work_dir=temp_work_dir,
+            dry_run=True,
+        )
+        runner = runner_module.WorkflowRunner(workflow_yaml_path, context)
+        runner.workflow = loaded_workflow_cache(workflow_yaml_path)
+
+        # This will raise if there's a cycle
+        order = runner.get_job_order()
+        assert len(order) > 0
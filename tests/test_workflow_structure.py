@@ -0,0 +1,79 @@
+"""Tests for workflow YAML structure, inputs and content references."""
+
+from pathlib import Path
+
+import pytest
+
+pytestmark = pytest.mark.io
+
+
+class TestWorkflowYamlValid:
+    """Test that workflow.yaml is valid YAML and has required structure."""
+
+    def test_is_valid_yaml(self, yaml_module, yaml_safe_load, workflow_content: str):
+        """Test that workflow.yaml is valid YAML."""
+        try:
+            yaml_safe_load(workflow_content)
+        except yaml_module.YAMLError as e:
+            pytest.fail(f"workflow.yaml is not valid YAML: {e}")
+
+    def test_has_permissions_section(self, workflow_data: dict):
+        """Test that workflow.yaml has a permissions section."""
+        assert "permissions" in workflow_data, "workflow.yaml must have 'permissions' section"
+
+    def test_has_sessions_section(self, workflow_data: dict):
+        """Test that workflow.yaml has a sessions section."""
+        assert "sessions" in workflow_data, "workflow.yaml must have 'sessions' section"
+
+    def test_has_jobs_section(self, workflow_data: dict):
+        """Test that workflow.yaml has a jobs section."""
+        assert "jobs" in workflow_data, "workflow.yaml must have 'jobs' section"
+
+    def test_has_execute_inputs_section(self, workflow_data: dict):
+        """Test that workflow.yaml has an on.execute.inputs section."""
+        assert "on" in workflow_data, "workflow.yaml must have 'on' section"
+        assert "execute" in workflow_data["on"], "workflow.yaml must have 'on.execute' section"
+        assert "inputs" in workflow_data["on"]["execute"], "workflow.yaml must have 'on.execute.inputs' section"
+
+
+class TestWorkflowInputs:
+    """Test that workflow.yaml has required inputs."""
+
+    def test_has_resource_input(self, workflow_data: dict):
+        """Test that workflow.yaml has a resource input."""
+        inputs = workflow_data.get("on", {}).get("execute", {}).get("inputs", {})
+        assert "resource" in inputs, "workflow.yaml must have 'resource' input"
+        assert inputs["resource"].get("type") == "compute-clusters", \
+            "resource input must be type 'compute-clusters'"
+
+    def test_has_workflow_dir_input(self, workflow_data: dict):
+        """Test that workflow.yaml has a workflow_dir input."""
+        inputs = workflow_data.get("on", {}).get("execute", {}).get("inputs", {})
+        assert "workflow_dir" in inputs, "workflow.yaml must have 'workflow_dir' input"
+
+
+@pytest.mark.parametrize("needle,msg", [
+    ("marketplace/job_runner", "workflow.yaml should use 'marketplace/job_runner'"),
+    ("utils/wait_service.sh", "sparse_checkout must include 'utils/wait_service.sh'"),
+    ("source utils/wait_service.sh", "wait_for_service job must source 'utils/wait_service.sh'"),
+    ("needs.wait_for_service.outputs.HOSTNAME",
+     "workflow must reference 'needs.wait_for_service.outputs.HOSTNAME'"),
+    ("needs.wait_for_service.outputs.SESSION_PORT",
+     "workflow must reference 'needs.wait_for_service.outputs.SESSION_PORT'"),
+    ("needs.update_session.outputs.local_port",
+     "workflow must reference 'needs.update_session.outputs.local_port'"),
+])
+def test_workflow_contains(workflow_tokens: dict, needle: str, msg: str):
+    """Test that workflow.yaml references required actions, scripts and outputs."""
+    assert workflow_tokens[needle], msg
+
+
+def test_workflow_no_old_patterns(workflow_content: str, old_workflow_pattern_re):
+    """Test that workflow.yaml doesn't reference old pattern elements (steps-v3, utility modules)."""
+    match = old_workflow_pattern_re.search(workflow_content)
+    assert not match, f"workflow.yaml should not reference old pattern '{match.group(0)}'"
+
+
+def test_workflow_yaml_exists(workflow_yaml: Path):
+    """Test that workflow.yaml file exists."""
+    assert workflow_yaml.exists(), f"workflow.yaml not found at {workflow_yaml}"
@@ -12,18 +12,45 @@ Usage:
 """
 
 import argparse
+import atexit
 import os
 import re
+import select
+import shlex
+import signal
 import subprocess
 import sys
 import tempfile
+import threading
 import shutil
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Callable, Iterable
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Matches a ${{ expression }} template
+_TEMPLATE_RE = re.compile(r'\$\{\{\s*(.+?)\s*\}\}')
+
+# A key=value line in a step's OUTPUTS file (split at the first '=')
+_OUTPUT_LINE_RE = re.compile(rb'(?m)^([^=\n]*)=(.*)$')
+
+# Lines of output kept for display when a command fails without --verbose
+_OUTPUT_TAIL_LINES = 200
+
+# Finds every space-delimited binary operator in an expression in one scan
+_OPERATOR_RE = re.compile(r' (?=(!=|==|\|\||&&) )')
+
+# A compiled expression: takes the extra (step-level) context, returns the value
+_Evaluator = Callable[[dict[str, Any]], Any]
+
 
 @dataclass
 class JobOutput:
@@ -33,6 +60,13 @@ class JobOutput:
     error: str | None = None
 
 
+@dataclass
+class _CompiledTemplate:
+    """A template string split into literal text around compiled ${{ }} expressions."""
+    literals: list[str]  # always one more than expressions
+    expressions: list[tuple[str, _Evaluator]]
+
+
 @dataclass
 class ExecutionContext:
     """Context for workflow execution."""
@@ -44,6 +78,116 @@ class ExecutionContext:
     dry_run: bool = False
     verbose: bool = False
     skip_ssh: bool = True  # Always skip SSH for local execution
+    max_jobs: int = 1  # Independent jobs allowed to run at the same time
+
+
+class _ShellSession:
+    """A long-lived bash process that runs each step command in a subshell.
+
+    Forking a subshell from a running bash is much cheaper than starting a new
+    bash (fork+exec plus environment setup) for every step. Each command runs
+    as ``( . script ) </dev/null``, so ``exit``, ``set -e`` and ``cd`` end or
+    affect only that step and do not leak into later ones. Unlike ``bash -c``,
+    a top-level ``return`` quietly ends the step instead of being an error.
+    Output goes to scratch files (read back by the caller) and the exit code
+    is reported back on the control pipe. ``$OUTPUTS`` also points into the
+    scratch dir and is emptied before each command, so every step (and every
+    concurrently running session) reports only its own outputs.
+
+    The shell runs in its own process group so a timeout can kill everything
+    a step started; sessions still open at interpreter exit are killed too.
+    """
+
+    def __init__(self, cwd: Path, env: dict[str, str]):
+        self._scratch = Path(tempfile.mkdtemp(prefix='workflow_shell_'))
+        self._script = self._scratch / 'command.sh'
+        self.stdout_path = self._scratch / 'stdout'
+        self.stderr_path = self._scratch / 'stderr'
+        self.outputs_path = self._scratch / 'outputs'
+        self._proc = subprocess.Popen(
+            ['bash', '--noprofile', '--norc'],
+            cwd=cwd,
+            env={**env, 'OUTPUTS': str(self.outputs_path)},
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            # Don't let a leftover step process hold the runner's stderr open
+            stderr=subprocess.DEVNULL,
+            text=True,
+            start_new_session=True,
+        )
+        _live_shell_sessions.add(self)
+
+    def run(self, command: str, timeout: float) -> int:
+        """Run a command and return its exit code.
+
+        Output is left in stdout_path/stderr_path, and step outputs in outputs_path.
+        """
+        self._script.write_text(command)
+        self.outputs_path.write_bytes(b'')
+        self._proc.stdin.write(
+            f'( . {shlex.quote(str(self._script))} ) </dev/null '
+            f'>{shlex.quote(str(self.stdout_path))} 2>{shlex.quote(str(self.stderr_path))}; '
+            'echo $?\n'
+        )
+        self._proc.stdin.flush()
+
+        try:
+            ready, _, _ = select.select([self._proc.stdout], [], [], timeout)
+            if not ready:
+                self.close(kill=True)
+                raise subprocess.TimeoutExpired(command, timeout)
+            status = self._proc.stdout.readline()
+        except ValueError:
+            # Closed under us by another thread aborting the run
+            status = ''
+        if not status:
+            self.close(kill=True)
+            raise RuntimeError("Shell session exited unexpectedly")
+
+        return int(status)
+
+    @property
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def close(self, kill: bool = False) -> None:
+        """Stop the shell (and, with kill, anything still running in it)."""
+        _live_shell_sessions.discard(self)
+        if self.alive:
+            if kill:
+                self.kill()
+            else:
+                self._proc.stdin.close()
+            try:
+                self._proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.kill()
+                self._proc.wait()
+        # Closing an already-closed stream is a no-op; flushing stdin to a
+        # dead shell can raise BrokenPipeError
+        for stream in (self._proc.stdin, self._proc.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        shutil.rmtree(self._scratch, ignore_errors=True)
+
+    def kill(self) -> None:
+        """SIGKILL the shell's process group, i.e. the shell and every step process."""
+        try:
+            os.killpg(self._proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+# Sessions not yet closed; killed at exit so no step outlives the runner
+_live_shell_sessions: set[_ShellSession] = set()
+
+
+@atexit.register
+def _kill_live_shell_sessions() -> None:
+    for session in list(_live_shell_sessions):
+        session.kill()
 
 
 class WorkflowRunner:
@@ -54,11 +198,68 @@ class WorkflowRunner:
         self.workflow_dir = workflow_path.parent
         self.context = context
         self.workflow: dict[str, Any] = {}
+        # id -> dict/list from the loaded workflow that holds no templates. The
+        # value keeps the object alive so its id can't be reused by another.
+        self._literal_nodes: dict[int, Any] = {}
+        # Parsed templates and expressions; these depend only on their text
+        self._compiled_templates: dict[str, _CompiledTemplate] = {}
+        self._compiled_expressions: dict[str, _Evaluator] = {}
+        # Memoized template results; only valid while sessions/job_outputs are unchanged
+        self._substitution_cache: dict[str, str] = {}
+        self._expression_cache: dict[str, Any] = {}
+        # One shell session per thread that runs steps
+        self._shells: dict[int, _ShellSession] = {}
+        # Set when a concurrent run is aborted, so workers start no new steps
+        self._stopping = False
+        # inputs.sh depends only on context.inputs, which is fixed for a run
+        self._inputs_sh_written = False
+        self._inputs_sh_lock = threading.Lock()
+        # Files that scripts write in the work dir to report where a service runs
+        self._coord_paths = {
+            name: os.fspath(context.work_dir / name)
+            for name in ('HOSTNAME', 'SESSION_PORT', 'slug')
+        }
+        # Environment for local commands, merged once instead of per step
+        self._base_env = {
+            **os.environ,
+            **context.env_vars,
+            'PW_PARENT_JOB_DIR': str(context.work_dir),
+        }
 
     def load_workflow(self) -> None:
         """Load and parse the workflow YAML file."""
-        with open(self.workflow_path) as f:
-            self.workflow = yaml.safe_load(f)
+        # Hand libyaml raw bytes; it decodes UTF-8 itself
+        with open(self.workflow_path, 'rb') as f:
+            data = f.read()
+        self.workflow = yaml.load(data, Loader=_YamlLoader)
+        self._literal_nodes = {}
+        self._index_templates(self.workflow)
+
+    def _index_templates(self, value: Any) -> bool:
+        """Compile templates and record template-free dicts/lists under value.
+
+        Returns True if value contains a template.
+        """
+        if isinstance(value, str):
+            if '${{' not in value:
+                return False
+            self._compile_template(value)
+            return True
+        if isinstance(value, dict):
+            children = value.values()
+        elif isinstance(value, list):
+            children = value
+        else:
+            return False
+
+        # Visit every child (no short-circuit) so nested literal nodes are indexed too
+        has_template = False
+        for child in children:
+            if self._index_templates(child):
+                has_template = True
+        if not has_template:
+            self._literal_nodes[id(value)] = value
+        return has_template
 
     def substitute_variables(self, value: Any, extra_context: dict[str, Any] | None = None) -> Any:
         """
@@ -72,89 +273,188 @@ class WorkflowRunner:
         - ${{ env.X }} - Environment variables
         - Simple expressions like: X != '' or X == 'value'
         """
-        if isinstance(value, str):
-            return self._substitute_string(value, extra_context)
-        elif isinstance(value, dict):
-            return {k: self.substitute_variables(v, extra_context) for k, v in value.items()}
-        elif isinstance(value, list):
-            return [self.substitute_variables(item, extra_context) for item in value]
-        return value
+        # Exact-type lookup covers what YAML produces; subclasses take the slow path
+        handler = self._SUBSTITUTERS.get(type(value))
+        if handler is None:
+            for base, base_handler in self._SUBSTITUTERS.items():
+                if isinstance(value, base):
+                    handler = base_handler
+                    break
+            else:
+                return value
+        return handler(self, value, extra_context)
+
+    def _substitute_dict(self, value: dict, extra_context: dict[str, Any] | None) -> Any:
+        """Substitute variables in each value of a dict."""
+        if self._literal_nodes.get(id(value)) is value:
+            # Nothing to substitute anywhere below; skip the walk and the copy
+            return value
+        return {k: self.substitute_variables(v, extra_context) for k, v in value.items()}
+
+    def _substitute_list(self, value: list, extra_context: dict[str, Any] | None) -> Any:
+        """Substitute variables in each item of a list."""
+        if self._literal_nodes.get(id(value)) is value:
+            return value
+        return [self.substitute_variables(item, extra_context) for item in value]
 
     def _substitute_string(self, text: str, extra_context: dict[str, Any] | None = None) -> str:
         """Substitute variables in a string."""
-        pattern = r'\$\{\{\s*(.+?)\s*\}\}'
-
-        def replacer(match: re.Match) -> str:
-            expr = match.group(1).strip()
-            return str(self._evaluate_expression(expr, extra_context))
-
-        return re.sub(pattern, replacer, text)
-
-    def _evaluate_expression(self, expr: str, extra_context: dict[str, Any] | None = None) -> Any:
-        """Evaluate a template expression."""
-        extra = extra_context or {}
+        # Most strings in a workflow contain no templates
+        if '${{' not in text:
+            return text
+
+        template = self._compile_template(text)
+        if extra_context:
+            values = [str(evaluate(extra_context)) for _, evaluate in template.expressions]
+            return self._join_template(template, values)
+
+        # Take both caches before reading any state. Invalidation swaps in new
+        # dicts, so a result computed from older state lands in a dropped cache.
+        substitutions = self._substitution_cache
+        expressions = self._expression_cache
+
+        cached = substitutions.get(text)
+        if cached is None:
+            values = []
+            for expr, evaluate in template.expressions:
+                try:
+                    value = expressions[expr]
+                except KeyError:
+                    value = expressions[expr] = evaluate({})
+                values.append(str(value))
+            cached = substitutions[text] = self._join_template(template, values)
+        return cached
+
+    # substitute_variables handlers by value type
+    _SUBSTITUTERS = {
+        str: _substitute_string,
+        dict: _substitute_dict,
+        list: _substitute_list,
+    }
+
+    @staticmethod
+    def _join_template(template: _CompiledTemplate, values: list[str]) -> str:
+        """Interleave a template's literal text with its evaluated expressions."""
+        parts = [template.literals[0]]
+        for value, literal in zip(values, template.literals[1:]):
+            parts.append(value)
+            parts.append(literal)
+        return ''.join(parts)
+
+    def _invalidate_substitution_cache(self) -> None:
+        """Forget memoized template results after sessions or job outputs change."""
+        # Replace rather than clear (expressions first), for jobs running in
+        # other threads; see _substitute_string
+        self._expression_cache = {}
+        self._substitution_cache = {}
+
+    def _compile_template(self, text: str) -> _CompiledTemplate:
+        """Split a string into literal text and compiled expressions, once per string."""
+        template = self._compiled_templates.get(text)
+        if template is None:
+            literals: list[str] = []
+            expressions: list[tuple[str, _Evaluator]] = []
+            last = 0
+            for match in _TEMPLATE_RE.finditer(text):
+                literals.append(text[last:match.start()])
+                expr = match.group(1).strip()
+                expressions.append((expr, self._compile_expression(expr)))
+                last = match.end()
+            literals.append(text[last:])
+            template = self._compiled_templates[text] = _CompiledTemplate(literals, expressions)
+        return template
+
+    def _compile_expression(self, expr: str) -> _Evaluator:
+        """Parse an expression once into a closure over the execution context."""
+        evaluator = self._compiled_expressions.get(expr)
+        if evaluator is None:
+            evaluator = self._compiled_expressions[expr] = self._build_evaluator(expr)
+        return evaluator
+
+    def _build_evaluator(self, expr: str) -> _Evaluator:
+        """Build the closure for an expression; see _compile_expression."""
+        # Locate the first occurrence of each operator in a single pass
+        operators: dict[str, int] = {}
+        for match in _OPERATOR_RE.finditer(expr):
+            operators.setdefault(match.group(1), match.start())
 
         # Handle comparison expressions
-        if ' != ' in expr:
-            left, right = expr.split(' != ', 1)
-            left_val = self._evaluate_expression(left.strip(), extra)
-            right_val = self._parse_literal(right.strip())
-            return left_val != right_val
-
-        if ' == ' in expr:
-            left, right = expr.split(' == ', 1)
-            left_val = self._evaluate_expression(left.strip(), extra)
-            right_val = self._parse_literal(right.strip())
-            return left_val == right_val
-
-        if ' || ' in expr:
-            parts = expr.split(' || ')
-            return any(self._evaluate_expression(p.strip(), extra) for p in parts)
-
-        if ' && ' in expr:
-            parts = expr.split(' && ')
-            return all(self._evaluate_expression(p.strip(), extra) for p in parts)
+        if '!=' in operators:
+            pos = operators['!=']
+            left = self._compile_expression(expr[:pos].strip())
+            right_val = self._parse_literal(expr[pos + 4:].strip())
+            return lambda extra: left(extra) != right_val
+
+        if '==' in operators:
+            pos = operators['==']
+            left = self._compile_expression(expr[:pos].strip())
+            right_val = self._parse_literal(expr[pos + 4:].strip())
+            return lambda extra: left(extra) == right_val
+
+        if '||' in operators:
+            parts = [self._compile_expression(p.strip()) for p in expr.split(' || ')]
+            return lambda extra: any(part(extra) for part in parts)
+
+        if '&&' in operators:
+            parts = [self._compile_expression(p.strip()) for p in expr.split(' && ')]
+            return lambda extra: all(part(extra) for part in parts)
 
         # Handle property access
-        if expr.startswith('inputs.'):
-            return self._get_nested_value(self.context.inputs, expr[7:])
-
-        if expr.startswith('sessions.'):
-            session_name = expr[9:]
-            return self.context.sessions.get(session_name, f"session-{session_name}")
-
-        if expr.startswith('needs.'):
-            # needs.job_name.outputs.output_name
-            parts = expr[6:].split('.')
-            if len(parts) >= 3 and parts[1] == 'outputs':
-                job_name = parts[0]
-                output_name = '.'.join(parts[2:])
-                job_output = self.context.job_outputs.get(job_name)
-                if job_output:
-                    return job_output.outputs.get(output_name, '')
+        if expr.startswith(self._PROPERTY_PREFIXES):
+            root, _, path = expr.partition('.')
+            return self._PROPERTY_COMPILERS[root](self, path)
+
+        # Check extra context (for step-level variables), else return the
+        # expression as-is if not recognized
+        return lambda extra: extra.get(expr, expr)
+
+    def _compile_input(self, path: str) -> _Evaluator:
+        """Compile inputs.X.Y into a walk over the nested input dicts."""
+        keys = path.split('.')
+
+        def resolve(extra: dict[str, Any]) -> Any:
+            current: Any = self.context.inputs
+            for key in keys:
+                if not isinstance(current, dict):
+                    return ''
+                current = current.get(key, '')
+            return current
+
+        return resolve
+
+    def _compile_session(self, session_name: str) -> _Evaluator:
+        """Compile sessions.X."""
+        default = f"session-{session_name}"
+        return lambda extra: self.context.sessions.get(session_name, default)
+
+    def _compile_job_output(self, path: str) -> _Evaluator:
+        """Compile needs.job_name.outputs.output_name."""
+        parts = path.split('.')
+        if len(parts) < 3 or parts[1] != 'outputs':
+            return lambda extra: ''
+        job_name = parts[0]
+        output_name = '.'.join(parts[2:])
+
+        def resolve(extra: dict[str, Any]) -> str:
+            job_output = self.context.job_outputs.get(job_name)
+            if job_output:
+                return job_output.outputs.get(output_name, '')
             return ''
 
-        if expr.startswith('env.'):
-            env_name = expr[4:]
-            return self.context.env_vars.get(env_name, os.environ.get(env_name, ''))
+        return resolve
 
-        # Check extra context (for step-level variables)
-        if expr in extra:
-            return extra[expr]
+    def _compile_env(self, env_name: str) -> _Evaluator:
+        """Compile env.X, read from the context with a fallback to the process environment."""
+        return lambda extra: self.context.env_vars.get(env_name, os.environ.get(env_name, ''))
 
-        # Return expression as-is if not recognized
-        return expr
-
-    def _get_nested_value(self, obj: dict, path: str) -> Any:
-        """Get a nested value from a dict using dot notation."""
-        parts = path.split('.')
-        current = obj
-        for part in parts:
-            if isinstance(current, dict):
-                current = current.get(part, '')
-            else:
-                return ''
-        return current
+    # Expression roots resolved from the execution context, and their compilers
+    _PROPERTY_COMPILERS = {
+        'inputs': _compile_input,
+        'sessions': _compile_session,
+        'needs': _compile_job_output,
+        'env': _compile_env,
+    }
+    _PROPERTY_PREFIXES = tuple(f'{root}.' for root in _PROPERTY_COMPILERS)
 
     def _parse_literal(self, value: str) -> Any:
         """Parse a literal value from an expression."""
@@ -178,34 +478,43 @@ class WorkflowRunner:
         """Return jobs in topologically sorted order based on dependencies."""
         jobs = self.workflow.get('jobs', {})
 
-        # Build dependency graph
-        dependencies: dict[str, set[str]] = {}
+        # Build dependency graph: in-degree per job and reverse edges to dependents
+        indegree: dict[str, int] = {}
+        dependents: dict[str, list[str]] = {}
         for job_name, job_config in jobs.items():
-            needs = job_config.get('needs', [])
-            if isinstance(needs, str):
-                needs = [needs]
-            dependencies[job_name] = set(needs)
+            needs = self._job_needs(job_config)
+            indegree[job_name] = len(needs)
+            for dep in needs:
+                dependents.setdefault(dep, []).append(job_name)
 
         # Topological sort (Kahn's algorithm)
         result: list[str] = []
-        no_deps = [j for j, deps in dependencies.items() if not deps]
+        no_deps = deque(j for j, degree in indegree.items() if degree == 0)
 
         while no_deps:
-            job = no_deps.pop(0)
+            job = no_deps.popleft()
             result.append(job)
 
-            for other_job, deps in dependencies.items():
-                if job in deps:
-                    deps.remove(job)
-                    if not deps and other_job not in result:
-                        no_deps.append(other_job)
+            for other_job in dependents.get(job, ()):
+                indegree[other_job] -= 1
+                if indegree[other_job] == 0:
+                    no_deps.append(other_job)
 
         if len(result) != len(jobs):
-            remaining = set(jobs.keys()) - set(result)
+            # Jobs left on a cycle (or waiting on a missing job) keep in-degree > 0
+            remaining = {j for j, degree in indegree.items() if degree > 0}
             raise ValueError(f"Circular dependency detected in jobs: {remaining}")
 
         return result
 
+    @staticmethod
+    def _job_needs(job_config: dict) -> set[str]:
+        """Return the names of the jobs a job depends on."""
+        needs = job_config.get('needs', [])
+        if isinstance(needs, str):
+            needs = [needs]
+        return set(needs)
+
     def run_job(self, job_name: str, job_config: dict) -> JobOutput:
         """Execute a single job."""
         print(f"\n{'='*60}")
@@ -220,7 +529,8 @@ class WorkflowRunner:
             print(f"\n  [{i+1}/{len(steps)}] {step_name}")
 
             try:
-                step_output = self.run_step(step, job_name)
+                # Substitute the whole step once (with, run, ssh, ...) as it starts
+                step_output = self.run_step(self.substitute_variables(step), job_name)
                 output.outputs.update(step_output)
             except Exception as e:
                 output.success = False
@@ -232,19 +542,16 @@ class WorkflowRunner:
         return output
 
     def run_step(self, step: dict, job_name: str) -> dict[str, str]:
-        """Execute a single step and return its outputs."""
+        """Execute a single step whose templates are already substituted; return its outputs."""
         outputs: dict[str, str] = {}
 
         # Handle 'uses' action
         if 'uses' in step:
-            action = step['uses']
-            action_with = self.substitute_variables(step.get('with', {}))
-            outputs = self.run_action(action, action_with, step)
+            outputs = self.run_action(step['uses'], step.get('with', {}), step)
 
         # Handle 'run' command
         if 'run' in step:
-            run_cmd = self.substitute_variables(step['run'])
-            outputs = self.run_shell_command(run_cmd, step)
+            outputs = self.run_shell_command(step['run'], step)
 
         return outputs
 
@@ -313,32 +620,27 @@ class WorkflowRunner:
             # Create a mock inputs.sh if we have inputs
             self._create_inputs_sh()
 
-            # Run the script
-            result = subprocess.run(
-                ['bash', str(script)],
-                cwd=self.context.work_dir,
-                env={**os.environ, **self.context.env_vars},
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-
-            if self.context.verbose or result.returncode != 0:
-                if result.stdout:
-                    print(f"    STDOUT:\n{self._indent(result.stdout)}")
-                if result.stderr:
-                    print(f"    STDERR:\n{self._indent(result.stderr)}")
+            # Run the script, sending output to disk rather than memory
+            with tempfile.TemporaryFile('w+') as stdout, tempfile.TemporaryFile('w+') as stderr:
+                result = subprocess.run(
+                    ['bash', str(script)],
+                    cwd=self.context.work_dir,
+                    env=self._base_env,
+                    stdout=stdout,
+                    stderr=stderr,
+                    timeout=300
+                )
+                stdout.seek(0)
+                stderr.seek(0)
+                self._report_output(result.returncode, stdout, stderr)
 
             if result.returncode != 0:
                 raise RuntimeError(f"Script failed with exit code {result.returncode}")
 
             # Read coordination files if they exist
-            outputs = {}
-            for coord_file in ['HOSTNAME', 'SESSION_PORT']:
-                coord_path = self.context.work_dir / coord_file
-                if coord_path.exists():
-                    outputs[coord_file] = coord_path.read_text().strip()
-                    print(f"    Output {coord_file}: {outputs[coord_file]}")
+            outputs = self._read_coord_files(('HOSTNAME', 'SESSION_PORT'))
+            for coord_file, value in outputs.items():
+                print(f"    Output {coord_file}: {value}")
 
             return outputs
         else:
@@ -372,80 +674,218 @@ class WorkflowRunner:
             print("    [DRY-RUN] Would execute command")
             return {}
 
-        # Create outputs file for the command to write to
-        outputs_file = self.context.work_dir / 'step_outputs.txt'
+        if self._stopping:
+            raise RuntimeError("Runner is shutting down")
 
-        env = {
-            **os.environ,
-            **self.context.env_vars,
-            'OUTPUTS': str(outputs_file),
-            'PW_PARENT_JOB_DIR': str(self.context.work_dir),
-        }
+        thread_id = threading.get_ident()
+        shell = self._shells.get(thread_id)
+        if shell is None or not shell.alive:
+            shell = self._shells[thread_id] = _ShellSession(self.context.work_dir, self._base_env)
 
-        result = subprocess.run(
-            ['bash', '-c', command],
-            cwd=self.context.work_dir,
-            env=env,
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
-
-        if self.context.verbose or result.returncode != 0:
-            if result.stdout:
-                print(f"    STDOUT:\n{self._indent(result.stdout)}")
-            if result.stderr:
-                print(f"    STDERR:\n{self._indent(result.stderr)}")
+        returncode = shell.run(command, timeout=300)
+        with open(shell.stdout_path) as stdout, open(shell.stderr_path) as stderr:
+            self._report_output(returncode, stdout, stderr)
 
-        if result.returncode != 0:
-            raise RuntimeError(f"Command failed with exit code {result.returncode}")
+        if returncode != 0:
+            raise RuntimeError(f"Command failed with exit code {returncode}")
 
-        # Parse outputs from OUTPUTS file
+        # Parse outputs from OUTPUTS file (the command may have deleted it)
         outputs = {}
-        if outputs_file.exists():
-            for line in outputs_file.read_text().splitlines():
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    outputs[key.strip()] = value.strip()
+        try:
+            with open(shell.outputs_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b''
+        for match in _OUTPUT_LINE_RE.finditer(data):
+            outputs[match.group(1).decode().strip()] = match.group(2).decode().strip()
 
         # Also check for coordination files
-        for coord_file in ['HOSTNAME', 'SESSION_PORT', 'slug']:
-            coord_path = self.context.work_dir / coord_file
-            if coord_path.exists():
-                outputs[coord_file] = coord_path.read_text().strip()
+        outputs.update(self._read_coord_files(('HOSTNAME', 'SESSION_PORT', 'slug')))
 
         return outputs
 
+    def _read_coord_files(self, names: Iterable[str]) -> dict[str, str]:
+        """Read whichever of the named coordination files exist in the work dir."""
+        values = {}
+        for name in names:
+            # Open directly; a missing file is the common case, no stat() first
+            try:
+                with open(self._coord_paths[name], 'rb') as f:
+                    values[name] = f.read().decode().strip()
+            except FileNotFoundError:
+                pass
+        return values
+
     def _create_inputs_sh(self) -> None:
-        """Create an inputs.sh file with exported variables."""
-        inputs_sh = self.context.work_dir / 'inputs.sh'
+        """Create an inputs.sh file with exported variables (once per runner)."""
+        with self._inputs_sh_lock:
+            if not self._inputs_sh_written:
+                self._write_inputs_sh()
+                self._inputs_sh_written = True
+
+    def _write_inputs_sh(self) -> None:
+        """Flatten context.inputs into export lines and write inputs.sh."""
         lines = ['#!/bin/bash', '# Auto-generated inputs for local testing']
 
-        def flatten_inputs(prefix: str, obj: Any) -> None:
+        # Depth-first walk with an explicit stack; children are pushed in
+        # reverse so exports keep the order of the inputs
+        stack: list[tuple[str, Any]] = [('', self.context.inputs)]
+        while stack:
+            prefix, obj = stack.pop()
             if isinstance(obj, dict):
-                for key, value in obj.items():
-                    new_prefix = f"{prefix}_{key}" if prefix else key
-                    flatten_inputs(new_prefix, value)
+                stack.extend(
+                    (f"{prefix}_{key}" if prefix else key, value)
+                    for key, value in reversed(obj.items())
+                )
+                continue
+
+            # Convert to shell-safe value
+            if isinstance(obj, bool):
+                val = 'true' if obj else 'false'
+            elif obj is None:
+                val = ''
             else:
-                # Convert to shell-safe value
-                if isinstance(obj, bool):
-                    val = 'true' if obj else 'false'
-                elif obj is None:
-                    val = ''
-                else:
-                    val = str(obj)
-                lines.append(f'export {prefix}="{val}"')
-
-        flatten_inputs('', self.context.inputs)
-        inputs_sh.write_text('\n'.join(lines) + '\n')
+                val = str(obj)
+            lines.append(f'export {prefix}="{val}"')
+
+        (self.context.work_dir / 'inputs.sh').write_text('\n'.join(lines) + '\n')
+
+    def close(self, kill: bool = False) -> None:
+        """Release the shell sessions used for run steps, if any were started.
+
+        With kill, commands still running in them are killed rather than waited for.
+        """
+        if kill:
+            # Kill every session before waiting on any of them
+            for shell in list(self._shells.values()):
+                shell.kill()
+        while self._shells:
+            _, shell = self._shells.popitem()
+            shell.close(kill=kill)
+
+    def _report_output(self, returncode: int, stdout: IO[str], stderr: IO[str]) -> None:
+        """Print a command's output: all of it when verbose, the tail when it failed."""
+        if self.context.verbose:
+            self._print_stream('STDOUT', stdout)
+            self._print_stream('STDERR', stderr)
+        elif returncode != 0:
+            self._print_stream('STDOUT', deque(stdout, maxlen=_OUTPUT_TAIL_LINES))
+            self._print_stream('STDERR', deque(stderr, maxlen=_OUTPUT_TAIL_LINES))
+
+    def _print_stream(self, label: str, lines: Iterable[str]) -> None:
+        """Print captured lines under a label, line by line; print nothing if empty."""
+        prefix = ' ' * 6
+        header_printed = False
+        for line in lines:
+            if not header_printed:
+                print(f"    {label}:")
+                header_printed = True
+            print(prefix + line.rstrip('\n'))
 
     def _indent(self, text: str, spaces: int = 6) -> str:
         """Indent text for display."""
         prefix = ' ' * spaces
         return '\n'.join(prefix + line for line in text.splitlines())
 
+    def _run_jobs_in_order(self, job_order: list[str]) -> bool:
+        """Run jobs one at a time in topological order."""
+        all_success = True
+        for job_name in job_order:
+            job_config = self.workflow['jobs'][job_name]
+
+            if not self._check_dependencies(job_name, job_config):
+                all_success = False
+                continue
+
+            output = self.run_job(job_name, job_config)
+            if not self._finish_job(job_name, output):
+                all_success = False
+
+        return all_success
+
+    def _run_jobs_concurrently(self, job_order: list[str]) -> bool:
+        """Run jobs on a thread pool, starting each one as soon as its needs finish."""
+        jobs = self.workflow['jobs']
+        waiting: dict[str, int] = {}
+        dependents: dict[str, list[str]] = {}
+        for job_name in job_order:
+            needs = self._job_needs(jobs[job_name])
+            waiting[job_name] = len(needs)
+            for dep in needs:
+                dependents.setdefault(dep, []).append(job_name)
+
+        ready = deque(j for j in job_order if waiting[j] == 0)
+        running: dict[Future, str] = {}
+        all_success = True
+
+        def release(finished: str) -> None:
+            for other_job in dependents.get(finished, ()):
+                waiting[other_job] -= 1
+                if waiting[other_job] == 0:
+                    ready.append(other_job)
+
+        # Only this thread writes job_outputs and invalidates the template
+        # caches. Workers read and fill the caches while substituting steps,
+        # which the snapshot-then-swap scheme in _substitute_string allows.
+        with ThreadPoolExecutor(max_workers=self.context.max_jobs) as pool:
+            try:
+                while ready or running:
+                    while ready:
+                        job_name = ready.popleft()
+                        if self._check_dependencies(job_name, jobs[job_name]):
+                            running[pool.submit(self.run_job, job_name, jobs[job_name])] = job_name
+                        else:
+                            all_success = False
+                            release(job_name)
+
+                    if not running:
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        job_name = running.pop(future)
+                        if not self._finish_job(job_name, future.result()):
+                            all_success = False
+                        release(job_name)
+            except BaseException:
+                # Leaving the with block waits for the workers; kill their
+                # steps and stop new ones so that wait is short
+                self._stopping = True
+                pool.shutdown(wait=False, cancel_futures=True)
+                self.close(kill=True)
+                raise
+
+        # Report in topological order rather than completion order
+        for job_name in job_order:
+            self.context.job_outputs[job_name] = self.context.job_outputs.pop(job_name)
+
+        return all_success
+
+    def _check_dependencies(self, job_name: str, job_config: dict) -> bool:
+        """Return True if a job's dependencies succeeded; otherwise record the job as skipped."""
+        deps_ok = all(
+            self.context.job_outputs.get(dep, JobOutput()).success
+            for dep in self._job_needs(job_config)
+        )
+        if not deps_ok:
+            print(f"\n[SKIP] Job {job_name} - dependency failed")
+            self.context.job_outputs[job_name] = JobOutput(success=False, error="Dependency failed")
+            self._invalidate_substitution_cache()
+        return deps_ok
+
+    def _finish_job(self, job_name: str, output: JobOutput) -> bool:
+        """Record a job's output and return whether it succeeded."""
+        self.context.job_outputs[job_name] = output
+        self._invalidate_substitution_cache()
+
+        if not output.success and not self.context.dry_run:
+            print(f"\n[FAIL] Job {job_name} failed: {output.error}")
+            # Continue to show what would happen in subsequent jobs
+        return output.success
+
     def run(self) -> bool:
         """Execute the workflow and return success status."""
+        # A previous run may have been aborted; that must not stop this one
+        self._stopping = False
         self.load_workflow()
 
         print(f"\nWorkflow: {self.workflow_path}")
@@ -457,6 +897,7 @@ class WorkflowRunner:
         for session_name in sessions:
             if session_name not in self.context.sessions:
                 self.context.sessions[session_name] = f"local-session-{session_name}"
+        self._invalidate_substitution_cache()
 
         print(f"\nSessions: {self.context.sessions}")
         print(f"Inputs: {self.context.inputs}")
@@ -466,34 +907,16 @@ class WorkflowRunner:
         print(f"\nJob execution order: {' -> '.join(job_order)}")
 
         # Execute jobs
-        all_success = True
-        for job_name in job_order:
-            job_config = self.workflow['jobs'][job_name]
-
-            # Check if dependencies succeeded
-            needs = job_config.get('needs', [])
-            if isinstance(needs, str):
-                needs = [needs]
-
-            deps_ok = all(
-                self.context.job_outputs.get(dep, JobOutput()).success
-                for dep in needs
-            )
-
-            if not deps_ok:
-                print(f"\n[SKIP] Job {job_name} - dependency failed")
-                self.context.job_outputs[job_name] = JobOutput(success=False, error="Dependency failed")
-                all_success = False
-                continue
-
-            output = self.run_job(job_name, job_config)
-            self.context.job_outputs[job_name] = output
-
-            if not output.success:
-                all_success = False
-                if not self.context.dry_run:
-                    print(f"\n[FAIL] Job {job_name} failed: {output.error}")
-                    # Continue to show what would happen in subsequent jobs
+        try:
+            if self.context.max_jobs > 1:
+                all_success = self._run_jobs_concurrently(job_order)
+            else:
+                all_success = self._run_jobs_in_order(job_order)
+        except BaseException:
+            # Interrupted (Ctrl-C, SIGTERM) or crashed: don't wait on running steps
+            self.close(kill=True)
+            raise
+        self.close()
 
         # Summary
         print(f"\n{'='*60}")
@@ -559,7 +982,41 @@ def get_default_inputs(workflow: dict) -> dict[str, Any]:
     return defaults
 
 
+def _link_or_copy(src: str, dest: str, link: bool = True) -> None:
+    """Hardlink src to dest, copying instead when not allowed or not possible."""
+    if link:
+        try:
+            os.link(src, dest)
+            return
+        except FileExistsError:
+            # Reused work dir: already linked by a previous run, or a stale copy
+            if os.path.samefile(src, dest):
+                return
+        except OSError:
+            # Cross-device link or filesystem without hardlink support
+            pass
+
+    # Remove what's there first so a copy never writes through a hardlink
+    # left by an earlier run into the repository file
+    try:
+        os.unlink(dest)
+    except FileNotFoundError:
+        pass
+    # Contents and mode (scripts stay executable) but not timestamps
+    shutil.copy(src, dest)
+
+
+def _exit_on_sigterm(signum: int, frame: Any) -> None:
+    """Turn SIGTERM into SystemExit so cleanup (finally, atexit) still runs."""
+    # timeout(1) and process managers may signal again (e.g. the whole group);
+    # don't let a second SIGTERM interrupt the cleanup started by the first
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    raise SystemExit(128 + signum)
+
+
 def main() -> int:
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+
     parser = argparse.ArgumentParser(
         description='Run Activate workflows locally for testing',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -575,6 +1032,9 @@ Examples:
 
   # Verbose output
   python tools/workflow_runner.py workflows/hello-world/workflow.yaml -v
+
+  # Run independent jobs in parallel
+  python tools/workflow_runner.py workflows/hello-world/workflow.yaml -j 4
 '''
     )
 
@@ -589,6 +1049,12 @@ Examples:
                         help='Working directory (default: temp dir)')
     parser.add_argument('--keep-work-dir', action='store_true',
                         help='Keep working directory after execution')
+    parser.add_argument('--copy', action='store_true',
+                        help='Copy workflow files and utils/ into the work dir. By default '
+                             'they are hardlinked/symlinked, so scripts that modify them in '
+                             'place change the repository copies')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Run up to N independent jobs at once (default: 1; output may interleave)')
 
     args = parser.parse_args()
 
@@ -597,8 +1063,9 @@ Examples:
         return 1
 
     # Load workflow to get defaults
-    with open(args.workflow) as f:
-        workflow = yaml.safe_load(f)
+    with open(args.workflow, 'rb') as f:
+        data = f.read()
+    workflow = yaml.load(data, Loader=_YamlLoader)
 
     # Build inputs from defaults + command line
     default_inputs = get_default_inputs(workflow)
@@ -648,6 +1115,7 @@ Examples:
             work_dir=work_dir,
             dry_run=args.dry_run,
             verbose=args.verbose,
+            max_jobs=args.jobs,
         )
 
         # Copy workflow files to work directory
@@ -655,15 +1123,25 @@ Examples:
         dest_workflow_dir = work_dir / 'workflows' / workflow_name
         dest_workflow_dir.mkdir(parents=True, exist_ok=True)
 
-        for f in args.workflow.parent.iterdir():
-            if f.is_file():
-                shutil.copy2(f, dest_workflow_dir)
+        # scandir entries already know their type, so no stat per file
+        with os.scandir(args.workflow.parent) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    _link_or_copy(entry.path, os.path.join(dest_workflow_dir, entry.name),
+                                  link=not args.copy)
 
-        # Copy utils
+        # Symlink utils (scripts only read them); copy with --copy or when a
+        # reused work dir already has a real utils/ tree
         utils_src = args.workflow.parent.parent.parent / 'utils'
+        utils_dest = work_dir / 'utils'
         if utils_src.exists():
-            utils_dest = work_dir / 'utils'
-            shutil.copytree(utils_src, utils_dest, dirs_exist_ok=True)
+            if args.copy and utils_dest.is_symlink():
+                # Left by an earlier run without --copy
+                utils_dest.unlink()
+            if args.copy or (utils_dest.exists() and not utils_dest.is_symlink()):
+                shutil.copytree(utils_src, utils_dest, dirs_exist_ok=True)
+            elif not utils_dest.is_symlink():
+                os.symlink(utils_src.resolve(), utils_dest, target_is_directory=True)
 
         runner = WorkflowRunner(args.workflow, context)
         success = runner.run()